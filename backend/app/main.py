@@ -1,22 +1,28 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 import pandas as pd
-import numpy as np
-from typing import List, Dict, Any
-import json
-from io import StringIO
-import plotly.express as px
-import plotly.graph_objects as go
+from typing import List, Dict, Any, Callable, Literal, Optional
 import logging
 import os
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 from app.utils.data_profiler import DataProfiler
 from app.utils.file_handler import FileHandler
+from app.utils.result_cache import ResultCache
 from app.schemas.responses import ProfileResponse, VisualizationResponse
 
 # Get environment variables with defaults
 PORT = int(os.getenv("PORT", 8000))
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+WORKERS = int(os.getenv("WORKERS", 4))
+RESULT_CACHE_MB = int(os.getenv("RESULT_CACHE_MB", 64))
+# Every uvicorn worker gets its own pool, so split the CPUs between them by default
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", max(1, (os.cpu_count() or 1) // WORKERS)))
+VIZ_WORKERS = int(os.getenv("VIZ_WORKERS", 1))
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://sambhar-frontend.vercel.app")  # Default to production URL
 
 # Configure logging to show more details
@@ -42,33 +48,63 @@ origins = [
     "http://localhost:5173",  # Development frontend URL
     "https://sambhar-88lre93rr-asif-mansoors-projects.vercel.app",
     "https://sambhar-frontend.vercel.app",
-    "https://sambhar-frontend-git-main.vercel.app",
-    "https://sambhar-frontend-*.vercel.app",
-    "https://*.vercel.app"
+    "https://sambhar-frontend-git-main.vercel.app"
 ]
 
 # Remove any empty strings and duplicates from origins
 origins = list(set([origin for origin in origins if origin]))
 logger.info(f"Configured CORS origins: {origins}")
 
-# Add CORS middleware with more detailed logging
-@app.middleware("http")
-async def log_requests(request, call_next):
-    logger.info(f"Incoming request: {request.method} {request.url}")
-    logger.info(f"Request headers: {request.headers}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
+# CORSMiddleware compares allow_origins literally, so Vercel preview deployments are
+# matched with a single regex compiled once by the middleware. Credentials are allowed,
+# and anyone can register a project called sambhar-<anything>, so the regex only matches
+# preview URLs carrying this team's scope suffix (<project>-<hash>-<team>.vercel.app);
+# production origins are listed explicitly above.
+CORS_ORIGIN_REGEX = r"https://sambhar(-frontend)?(-[a-z0-9-]+)?-asif-mansoors-projects\.vercel\.app"
+
+# Per-request logging is a development aid; production skips the middleware entirely.
+# Lazy %s arguments mean nothing is formatted unless DEBUG logging is enabled.
+if ENVIRONMENT == "development":
+    @app.middleware("http")
+    async def log_requests(request, call_next):
+        logger.debug("Incoming request: %s %s", request.method, request.url)
+        logger.debug("Request headers: %s", request.headers)
+        response = await call_next(request)
+        logger.debug("Response status: %s", response.status_code)
+        return response
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Temporarily allow all origins for debugging
+    allow_origins=origins,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
     expose_headers=["*"]
 )
 
+def make_profiling_pool() -> ProcessPoolExecutor:
+    """Create the pool that parses and profiles uploads."""
+    # Spawn rather than fork: forking a process with a running event loop and threads is unsafe
+    return ProcessPoolExecutor(max_workers=PROFILE_WORKERS, mp_context=get_context("spawn"))
+
+# Parsing and profiling are CPU-bound pandas/NumPy work; separate processes keep them off
+# the event loop
+profiling_pool = make_profiling_pool()
+
+# Profile layouts accepted by /upload and /profile: "aos" (one dict per column, as the
+# frontend expects) or "soa" (one array per metric, aligned with "columns")
+ProfileLayout = Literal["aos", "soa"]
+
+# Serialized responses for repeated uploads of the same file, per worker process
+result_cache = ResultCache(max_bytes=RESULT_CACHE_MB * 1024 * 1024)
+
+def cache_key(file_handler: FileHandler, file: UploadFile, *parts: Any) -> tuple:
+    """Build a cache key from the endpoint parts, file extension and content hash."""
+    # Reject oversized uploads before reading them end to end for the hash
+    file_handler.validate_file_size(file)
+    return (*parts, os.path.splitext(file.filename)[1], file_handler.compute_hash(file))
+
 # Add health check endpoint
 @app.get("/health")
 async def health_check():
@@ -78,46 +114,103 @@ async def health_check():
 async def root():
     return {"message": "Welcome to Sambhar API"}
 
+def load_upload(filename: str, content: bytes) -> pd.DataFrame:
+    """Parse an upload's bytes into a DataFrame; runs in the profiling pool."""
+    try:
+        return FileHandler().parse_file(filename, io.BytesIO(content))
+    except HTTPException as e:
+        # HTTPException can't be unpickled in the parent, which would break the pool
+        raise ValueError(e.detail) from None
+
+def build_upload_response(filename: str, content: bytes, layout: str) -> bytes:
+    """Parse and profile an upload and serialize the result; runs in the profiling pool."""
+    profiler = DataProfiler(load_upload(filename, content))
+    return profiler.to_json(profiler.generate_profile(layout=layout))
+
+def build_profile_response(filename: str, content: bytes, layout: str) -> bytes:
+    """Parse, profile, visualize and summarize an upload; runs in the profiling pool."""
+    logger.debug("Generating profile...")
+    profiler = DataProfiler(load_upload(filename, content))
+    profile = profiler.generate_profile(layout=layout)
+    
+    logger.debug("Generating visualizations...")
+    # Requests already run in parallel across the profiling pool; VIZ_WORKERS > 1 also
+    # spreads one wide frame's figures over processes
+    visualizations = profiler.generate_visualizations(max_workers=VIZ_WORKERS)
+    
+    logger.debug("Generating summary...")
+    summary = profiler.generate_summary()
+    
+    return profiler.to_json({
+        "profile": profile,
+        "visualizations": visualizations,
+        "summary": summary
+    })
+
+def build_visualization_response(
+    filename: str, content: bytes, viz_type: str, columns: Optional[List[str]]
+) -> bytes:
+    """Parse an upload, then generate and serialize one visualization; runs in the profiling pool."""
+    profiler = DataProfiler(load_upload(filename, content))
+    viz = profiler.generate_specific_visualization(viz_type, columns)
+    return profiler.to_json({
+        "plot_data": viz,
+        "viz_type": viz_type
+    })
+
+async def run_in_pool(func: Callable[..., bytes], *args: Any) -> bytes:
+    """Run CPU-bound profiling in the process pool so the event loop stays responsive."""
+    global profiling_pool
+    pool = profiling_pool
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A child died (e.g. OOM-killed on a large upload) and the executor can't be reused.
+        # Replace it so later requests on this worker succeed; requests that were running on
+        # the broken pool fail rather than retry, since a retry would likely crash it again.
+        if profiling_pool is pool:
+            logger.error("Profiling process exited unexpectedly, restarting the pool")
+            pool.shutdown(wait=False, cancel_futures=True)
+            profiling_pool = make_profiling_pool()
+        raise RuntimeError(
+            "The profiling process exited unexpectedly, possibly running out of memory"
+        ) from None
+
+@app.on_event("shutdown")
+def shutdown_profiling_pool():
+    profiling_pool.shutdown(wait=False, cancel_futures=True)
+
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), layout: ProfileLayout = "aos"):
     try:
-        logger.info(f"Received file: {file.filename}")
+        logger.debug("Received file: %s", file.filename)
         file_handler = FileHandler()
-        df = await file_handler.process_file(file)
-        
-        # Generate profile
-        profiler = DataProfiler(df)
-        profile = profiler.generate_profile()
+        key = cache_key(file_handler, file, "upload", layout)
+        response = result_cache.get(key)
+        if response is None:
+            # Parsing runs in the pool too; the bytes pickle far cheaper than a DataFrame
+            content = await file.read()
+            response = await run_in_pool(build_upload_response, file.filename, content, layout)
+            result_cache.put(key, response)
         
-        return JSONResponse(content=profiler._convert_to_serializable(profile))
+        return Response(content=response, media_type="application/json")
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/profile")
-async def profile_data(file: UploadFile = File(...)):
+async def profile_data(file: UploadFile = File(...), layout: ProfileLayout = "aos"):
     try:
-        logger.info(f"Processing file for profiling: {file.filename}")
+        logger.debug("Processing file for profiling: %s", file.filename)
         file_handler = FileHandler()
-        df = await file_handler.process_file(file)
+        key = cache_key(file_handler, file, "profile", layout)
+        response = result_cache.get(key)
+        if response is None:
+            content = await file.read()
+            response = await run_in_pool(build_profile_response, file.filename, content, layout)
+            result_cache.put(key, response)
         
-        logger.info("Generating profile...")
-        profiler = DataProfiler(df)
-        profile = profiler.generate_profile()
-        
-        logger.info("Generating visualizations...")
-        visualizations = profiler.generate_visualizations()
-        
-        logger.info("Generating summary...")
-        summary = profiler.generate_summary()
-        
-        response = profiler._convert_to_serializable({
-            "profile": profile,
-            "visualizations": visualizations,
-            "summary": summary
-        })
-        
-        return JSONResponse(content=response)
+        return Response(content=response, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in profile_data: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -129,17 +222,16 @@ async def generate_visualization(
     columns: List[str] = None
 ):
     try:
-        logger.info(f"Generating visualization of type {viz_type}")
+        logger.debug("Generating visualization of type %s", viz_type)
         file_handler = FileHandler()
-        df = await file_handler.process_file(file)
-        
-        profiler = DataProfiler(df)
-        viz = profiler.generate_specific_visualization(viz_type, columns)
+        key = cache_key(file_handler, file, "visualize", viz_type, tuple(columns or ()))
+        response = result_cache.get(key)
+        if response is None:
+            content = await file.read()
+            response = await run_in_pool(build_visualization_response, file.filename, content, viz_type, columns)
+            result_cache.put(key, response)
         
-        return JSONResponse(content=profiler._convert_to_serializable({
-            "plot_data": viz,
-            "viz_type": viz_type
-        }))
+        return Response(content=response, media_type="application/json")
     except Exception as e:
         logger.error(f"Error generating visualization: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -147,4 +239,12 @@ async def generate_visualization(
 if __name__ == "__main__":
     import uvicorn
     logger.info(f"Starting uvicorn server on port {PORT}")
-    uvicorn.run(app, host="0.0.0.0", port=PORT) 
\ No newline at end of file
+    # Multiple workers need the app as an import string; uvloop/httptools replace asyncio/h11
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=WORKERS
+    ) 
\ No newline at end of file
@@ -1,181 +1,596 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy import stats
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
+from functools import cached_property, lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import logging
-import json
+import warnings
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# numpy arrays/scalars are written by orjson in C; everything else goes through _json_default
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Above this many rows, distribution metrics and plots are computed on a random sample
+DEFAULT_SAMPLE_ROWS = 1_000_000
+
+# DataFrame.attrs key under which loaders record dtypes they narrowed for storage only
+SOURCE_DTYPES_ATTR = "source_dtypes"
+
+# Rows per block when accumulating pairwise correlation sums, bounding the temporaries
+CORR_CHUNK_ROWS = 65_536
+
+# Numeric stats reported per column, in output order
+NUMERIC_STATS = ("mean", "std", "min", "max", "median", "skewness", "kurtosis")
+
+# Below this many figures, starting worker processes costs more than it saves
+MIN_PARALLEL_FIGURES = 8
+
+# Layout templates for the per-column figures, shallow-copied per figure instead of being
+# rebuilt and validated through plotly's figure objects; they match what plotly.express emits
+_HIST_LAYOUT = {"margin": {"t": 60}, "bargap": 0}
+_BAR_LAYOUT = {"legend": {"tracegroupgap": 0}, "margin": {"t": 60}, "barmode": "relative"}
+_LINE_LAYOUT = {"legend": {"tracegroupgap": 0}, "margin": {"t": 60}}
+
+@lru_cache(maxsize=None)
+def _plotly_template() -> Dict[str, Any]:
+    """The default plotly theme as a dict, built once and shared by every figure."""
+    # plotly is imported where figures are built, so profile-only callers never load it
+    import plotly.io as pio
+
+    return pio.templates[pio.templates.default].to_plotly_json()
+
+def _figure(trace: Dict[str, Any], layout: Dict[str, Any], x_title: str, y_title: str) -> Dict[str, Any]:
+    """Assemble a single-trace figure dict from a layout template."""
+    return {
+        "data": [{**trace, "xaxis": "x", "yaxis": "y"}],
+        "layout": {
+            **layout,
+            "xaxis": {"anchor": "y", "domain": [0.0, 1.0], "title": {"text": x_title}},
+            "yaxis": {"anchor": "x", "domain": [0.0, 1.0], "title": {"text": y_title}},
+            "template": _plotly_template()
+        }
+    }
+
+def _binned_histogram(column: Any, data: pd.Series, bins: int = 30) -> Dict[str, Any]:
+    """Bin a numeric or datetime column with NumPy and plot the counts as adjacent bars.
+
+    Only the bin counts reach the figure, so its size does not grow with the row count.
+    """
+    values = data.dropna()
+    if values.dtype.kind == "M":
+        # Bin on epoch nanoseconds, then turn the bin centers back into dates;
+        # plotly sizes bars on a date axis in milliseconds
+        dates = pd.DatetimeIndex(values).as_unit("ns")
+        counts, edges = np.histogram(dates.asi8, bins=bins)
+        centers = pd.to_datetime(((edges[:-1] + edges[1:]) / 2).astype(np.int64), unit="ns")
+        if dates.tz is not None:
+            centers = centers.tz_localize("UTC").tz_convert(dates.tz)
+        trace = {"type": "bar", "x": centers.to_numpy(), "y": counts, "width": np.diff(edges) / 1e6}
+    else:
+        counts, edges = np.histogram(values.to_numpy(dtype=np.float64), bins=bins)
+        trace = {"type": "bar", "x": (edges[:-1] + edges[1:]) / 2, "y": counts, "width": np.diff(edges)}
+    return _figure(trace, _HIST_LAYOUT, str(column), "count")
+
+def _column_figure(kind: str, column: Any, data: pd.Series) -> Dict[str, Any]:
+    """Build the plotly dict for one column; module-level so worker processes can run it."""
+    if kind == "histogram":
+        return _binned_histogram(column, data)
+    if kind == "bar":
+        trace = {
+            "type": "bar",
+            "x": data.index.to_numpy(),
+            "y": data.to_numpy(),
+            "alignmentgroup": "True",
+            "hovertemplate": "category=%{x}<br>count=%{y}<extra></extra>",
+            "legendgroup": "",
+            "marker": {"color": "#636efa", "pattern": {"shape": ""}},
+            "name": "",
+            "offsetgroup": "",
+            "orientation": "v",
+            "showlegend": False,
+            "textposition": "auto"
+        }
+        return _figure(trace, _BAR_LAYOUT, "category", "count")
+    # Like px.line with only x given, the values are plotted against the frame index
+    trace = {
+        "type": "scatter",
+        "mode": "lines",
+        "x": data.to_numpy(),
+        "y": data.index.to_numpy(),
+        "hovertemplate": f"{column}=%{{x}}<br>index=%{{y}}<extra></extra>",
+        "legendgroup": "",
+        "line": {"color": "#636efa", "dash": "solid"},
+        "marker": {"symbol": "circle"},
+        "name": "",
+        "orientation": "h",
+        "showlegend": False
+    }
+    return _figure(trace, _LINE_LAYOUT, str(column), "index")
+
+def _correlation_figure(corr_matrix: pd.DataFrame) -> Dict[str, Any]:
+    """Build the plotly dict for a correlation heatmap."""
+    import plotly.express as px
+
+    fig = px.imshow(
+        corr_matrix.values,
+        labels=dict(x="Features", y="Features", color="Correlation"),
+        x=corr_matrix.columns,
+        y=corr_matrix.columns
+    )
+    return fig.to_dict()
+
 class DataProfiler:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS, copy: bool = False):
+        # The caller's frame is used as is (re-encoded columns go on a shallow copy);
+        # copy=True is for callers that keep mutating their frame while profiling
+        if copy:
+            df = df.copy()
         self.df = df
-        # Don't consider columns with infinite values or all-null as numeric
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        self.numeric_cols = [col for col in numeric_cols 
-                           if not (df[col].isna().all() or 
-                                 any(np.isinf(df[col].dropna())))]
-        self.categorical_cols = df.select_dtypes(include=['object', 'category', 'bool']).columns
-        self.datetime_cols = df.select_dtypes(include=['datetime64']).columns
+        # Bucket columns by dtype kind in one pass instead of one select_dtypes scan per group.
+        # Category and string dtypes report kind 'O'; tz-aware datetimes report 'M'.
+        kinds = np.array([dtype.kind for dtype in df.dtypes], dtype='U1')
+        # Timedeltas (kind 'm') are left out: the numeric stats can't mix them with floats.
+        numeric = df.loc[:, np.isin(kinds, ['i', 'u', 'f', 'c'])]
+        # Don't consider columns with infinite values or all-null as numeric. The inf check
+        # runs on a float view because np.isinf rejects Arrow-backed and nullable dtypes.
+        # Complex columns would lose their imaginary part there, so they keep the direct check.
+        if 'c' in kinds:
+            infinite = np.isinf(numeric).any().to_numpy(dtype=bool)
+        else:
+            infinite = np.isinf(numeric.to_numpy(dtype=np.float64, na_value=np.nan)).any(axis=0)
+        excluded = numeric.isna().all().to_numpy(dtype=bool) | infinite
+        self.numeric_cols = numeric.columns[~excluded]
+        self.categorical_cols = df.columns[np.isin(kinds, ['O', 'b'])]
+        self.datetime_cols = df.columns[kinds == 'M']
+        # Re-encoding (here, or downcasting in the file loader) changes storage dtypes only;
+        # the profile reports the types the data had
+        self._source_dtypes = df.dtypes.astype(str)
+        self._source_dtypes.update(pd.Series(df.attrs.get(SOURCE_DTYPES_ATTR, {}), dtype=object))
+        self.df = self._encode_low_cardinality(df)
+        # Missing counts, date bounds and the shape stay exact on the full frame; value
+        # counts, numeric stats, correlations and plots converge well on a sample
+        self.sampled = sample_rows is not None and len(self.df) > sample_rows
+        if self.sampled:
+            # sample() shuffles; restore row order so line charts still follow the data
+            self._sample = self.df.sample(n=sample_rows, random_state=0).sort_index()
+        else:
+            self._sample = self.df
+        self._value_counts_cache: Dict[Any, pd.Series] = {}
+
+    def _encode_low_cardinality(self, df: pd.DataFrame, max_ratio: float = 0.5) -> pd.DataFrame:
+        """Store low-cardinality object columns as category codes for cheaper counting.
+
+        Other object columns holding only strings are stored as Arrow-backed strings,
+        which hash in C during value counts instead of as Python objects.
+        """
+        encoded = {}
+        for col in self.categorical_cols:
+            series = df[col]
+            if series.dtype != object or len(series) == 0:
+                continue
+            try:
+                # One factorization both measures the cardinality and builds the codes
+                categorical = pd.Categorical(series)
+            except TypeError:  # Unhashable values such as lists from nested JSON
+                continue
+            if len(categorical.categories) < len(series) * max_ratio:
+                encoded[col] = categorical
+            elif categorical.categories.inferred_type == "string":
+                # The distinct values are already known, so this check costs no extra scan
+                encoded[col] = series.astype("string[pyarrow]")
+        if not encoded:
+            return df
+        # Shallow copy so the caller's frame keeps its original columns
+        df = df.copy(deep=False)
+        for col, categorical in encoded.items():
+            df[col] = categorical
+        return df
+
+    @cached_property
+    def _corr_matrix(self) -> Optional[pd.DataFrame]:
+        """Correlation matrix of the numeric columns, computed once per profiler."""
+        if len(self.numeric_cols) > 1 and len(self._sample) > 1:  # Need at least 2 numeric columns and 2 rows
+            values = self._sample[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if np.isnan(values).any():
+                    corr = self._pairwise_corr(values)
+                else:
+                    # Without missing values np.corrcoef goes straight to BLAS
+                    corr = np.corrcoef(values, rowvar=False)
+            return pd.DataFrame(corr, index=self.numeric_cols, columns=self.numeric_cols)
+        return None
+
+    @staticmethod
+    def _pairwise_corr(values: np.ndarray) -> np.ndarray:
+        """Pearson correlation over pairwise-complete rows, like DataFrame.corr(), as matrix products.
+
+        Each sum over the rows where both columns are present is a product of the
+        zero-filled values with the validity mask, so BLAS does all pairs at once.
+        The sums are accumulated over row chunks, so temporaries stay CORR_CHUNK_ROWS x k.
+        """
+        n_cols = values.shape[1]
+        chunks = [values[start:start + CORR_CHUNK_ROWS] for start in range(0, len(values), CORR_CHUNK_ROWS)]
+
+        # Centering first keeps the sum-of-squares differences from cancelling catastrophically;
+        # float64 is kept for the same reason
+        totals = np.zeros(n_cols)
+        present = np.zeros(n_cols)
+        for chunk in chunks:
+            valid = ~np.isnan(chunk)
+            totals += np.where(valid, chunk, 0.0).sum(axis=0)
+            present += valid.sum(axis=0)
+        means = totals / present
+
+        count = np.zeros((n_cols, n_cols))
+        sums = np.zeros((n_cols, n_cols))  # [i, j]: sum of column i over rows where j is also present
+        squares = np.zeros((n_cols, n_cols))
+        products = np.zeros((n_cols, n_cols))
+        for chunk in chunks:
+            valid = ~np.isnan(chunk)
+            filled = np.where(valid, chunk - means, 0.0)
+            mask = valid.astype(np.float64)
+            count += mask.T @ mask
+            sums += filled.T @ mask
+            squares += (filled * filled).T @ mask
+            products += filled.T @ filled
+
+        cov = products - sums * sums.T / count
+        var_x = squares - sums * sums / count
+        corr = cov / np.sqrt(var_x * var_x.T)
+        return np.clip(corr, -1.0, 1.0)
 
     def _convert_to_serializable(self, obj: Any) -> Any:
         """Convert numpy types to Python native types."""
-        if isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-            np.int16, np.int32, np.int64, np.uint8, np.uint16,
-            np.uint32, np.uint64)):
-            return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
-            if np.isnan(obj) or pd.isna(obj):
+        # One dict lookup on the exact type covers the common values; subclasses and
+        # anything unusual go through the isinstance chain
+        handler = self._HANDLERS.get(type(obj))
+        if handler is not None:
+            return handler(self, obj)
+        return self._slow_convert(obj)
+
+    def _convert_native(self, obj: Any) -> Any:
+        return obj
+
+    def _convert_float(self, obj: float) -> Optional[float]:
+        return None if obj != obj else obj
+
+    def _convert_sequence(self, obj: Any) -> List[Any]:
+        return [self._convert_to_serializable(x) for x in obj.tolist()]
+
+    def _convert_dict(self, obj: dict) -> Dict[str, Any]:
+        return {str(k): self._convert_to_serializable(v) for k, v in obj.items()}
+
+    def _convert_list(self, obj: Any) -> List[Any]:
+        return [self._convert_to_serializable(x) for x in obj]
+
+    def _convert_datetime(self, obj: datetime) -> str:
+        return obj.isoformat()
+
+    def _convert_numpy_scalar(self, obj: np.generic) -> Any:
+        # .item() gives the native value
+        value = obj.item()
+        if isinstance(value, float):
+            if value != value:
                 return None
-            elif np.isinf(obj):
-                return str(obj)  # Convert infinity to string representation
-            return float(obj)
-        elif isinstance(obj, (np.bool_)):
-            return bool(obj)
-        elif isinstance(obj, (np.ndarray,)):
-            return [self._convert_to_serializable(x) for x in obj.tolist()]
-        elif isinstance(obj, pd.Series):
-            return [self._convert_to_serializable(x) for x in obj.tolist()]
+            elif value in (float('inf'), float('-inf')):
+                return str(value)  # Convert infinity to string representation
+            return value
+        elif isinstance(value, (bool, int, str)) and not isinstance(obj, (np.datetime64, np.timedelta64)):
+            return value
+        return None if pd.isna(obj) else str(obj)
+
+    def _slow_convert(self, obj: Any) -> Any:
+        """Convert values by isinstance checks; the fallback for types missing from _HANDLERS."""
+        if isinstance(obj, np.generic):
+            # np.generic is the base of every numpy scalar
+            return self._convert_numpy_scalar(obj)
+        elif isinstance(obj, (np.ndarray, pd.Series)):
+            return self._convert_sequence(obj)
         elif isinstance(obj, pd.DataFrame):
-            return {col: [self._convert_to_serializable(x) for x in obj[col].tolist()] for col in obj.columns}
+            return {col: self._convert_sequence(obj[col]) for col in obj.columns}
         elif isinstance(obj, dict):
-            return {str(k): self._convert_to_serializable(v) for k, v in obj.items()}
+            return self._convert_dict(obj)
         elif isinstance(obj, (list, tuple)):
-            return [self._convert_to_serializable(x) for x in obj]
+            return self._convert_list(obj)
         elif isinstance(obj, (datetime, pd.Timestamp)):
-            return obj.isoformat()
+            return self._convert_datetime(obj)
         elif pd.isna(obj):
             return None
         elif isinstance(obj, (complex, np.complex64, np.complex128)):
             return str(obj)
         return str(obj) if not isinstance(obj, (str, int, float, bool, type(None))) else obj
 
-    def _ensure_json_serializable(self, obj: Any) -> Any:
-        """Ensure an object is JSON serializable by testing it."""
-        try:
-            json.dumps(obj)
-            return obj
-        except (TypeError, OverflowError):
-            return self._convert_to_serializable(obj)
-
-    def generate_profile(self) -> Dict[str, Any]:
-        """Generate comprehensive profile for all columns."""
-        profile = {}
+    _HANDLERS: Dict[type, Callable[["DataProfiler", Any], Any]] = {
+        str: _convert_native,
+        int: _convert_native,
+        bool: _convert_native,
+        type(None): _convert_native,
+        float: _convert_float,
+        dict: _convert_dict,
+        list: _convert_list,
+        tuple: _convert_list,
+        np.ndarray: _convert_sequence,
+        pd.Series: _convert_sequence,
+        pd.Timestamp: _convert_datetime,
+        datetime: _convert_datetime,
+        # dict.fromkeys rather than a comprehension, which could not see class-level names
+        **dict.fromkeys((
+            np.bool_, np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32,
+            np.uint64, np.float16, np.float32, np.float64
+        ), _convert_numpy_scalar)
+    }
+
+    def _json_default(self, obj: Any) -> Any:
+        """orjson fallback for types it cannot serialize natively."""
+        if isinstance(obj, (np.ndarray, pd.Series, pd.Index)):
+            # Non-contiguous or object-dtype arrays end up here
+            return obj.tolist()
+        return self._convert_to_serializable(obj)
+
+    def to_json(self, obj: Any) -> bytes:
+        """Serialize profiler output (including raw numpy/plotly data) to JSON bytes."""
+        return orjson.dumps(obj, default=self._json_default, option=JSON_OPTIONS)
+
+    def _value_counts(self, column: str) -> pd.Series:
+        """Non-null value counts for a column, computed once and shared by profile and plots."""
+        if column not in self._value_counts_cache:
+            counts = self._sample[column].value_counts()
+            if isinstance(counts.index, pd.CategoricalIndex):
+                # Categorical columns also report categories that never occur
+                counts = counts[counts > 0]
+            elif not isinstance(counts.dtype, np.dtype):
+                # Arrow-backed columns count into int64[pyarrow]; plots and to_json expect numpy
+                counts = counts.astype(np.int64)
+            self._value_counts_cache[column] = counts
+        return self._value_counts_cache[column]
+
+    def generate_profile(self, layout: str = "aos") -> Dict[str, Any]:
+        """Generate comprehensive profile for all columns.
+
+        The default "aos" layout maps each column to a dict of its metrics, as the
+        frontend expects. "soa" maps each metric to an array aligned with "columns";
+        the /upload and /profile endpoints return it for ?layout=soa.
+        Values are left as numpy/pandas scalars; to_json serializes them.
+        """
+        if layout not in ("aos", "soa"):
+            raise ValueError(f"Unsupported profile layout: {layout}")
+        stats = self._frame_stats()
+        if layout == "soa":
+            return self._profile_arrays(stats)
+        return {col: self._profile_column(col, stats) for col in self.df.columns}
+
+    def _profile_arrays(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the profile as one array per metric instead of one dict per column."""
+        total = len(self.df)
+        missing = stats["missing"].to_numpy()
+        populated = missing < total
+        # Same operation order as the per-column layout so both give identical floats;
+        # an empty frame has no populated columns, so max() only avoids dividing by zero
+        percentage = np.where(populated, missing / max(total, 1) * 100, 100.0)
         
-        for col in self.df.columns:
-            profile[col] = self._profile_column(col)
-            
-        return profile
+        numeric = stats["numeric"]
+        numeric = numeric[numeric["count"] > 0]
+        dates = pd.DataFrame({"min_date": stats["min_date"], "max_date": stats["max_date"]}).dropna()
+        
+        return {
+            "columns": self.df.columns.tolist(),
+            # Unique counts, top values and numeric stats come from the row sample
+            "approximate": self.sampled,
+            "data_type": self._source_dtypes.tolist(),
+            "missing_count": missing,
+            "missing_percentage": percentage,
+            "unique_count": np.array([
+                len(self._value_counts(col)) if has_values else 0
+                for col, has_values in zip(self.df.columns, populated)
+            ], dtype=np.int64),
+            "top_values": [
+                self._top_values(col).rename(index=str).to_dict() if has_values else {}
+                for col, has_values in zip(self.df.columns, populated)
+            ],
+            "numeric_stats": {
+                "columns": numeric.index.tolist(),
+                **{name: numeric[name].to_numpy() for name in NUMERIC_STATS}
+            },
+            "temporal_stats": {
+                "columns": dates.index.tolist(),
+                "min_date": dates["min_date"].to_numpy(),
+                "max_date": dates["max_date"].to_numpy(),
+                # Without datetime columns the bounds are empty object Series
+                "date_range_days": pd.to_timedelta(dates["max_date"] - dates["min_date"]).dt.days.to_numpy()
+            }
+        }
+
+    def _frame_stats(self) -> Dict[str, Any]:
+        """Compute per-column metrics with one frame-level pass per metric."""
+        return {
+            "missing": self._missing_counts,
+            "numeric": self._numeric_stats(),
+            # Reductions skip NaT, so no per-column dropna() copy is needed
+            "min_date": self.df[self.datetime_cols].min(),
+            "max_date": self.df[self.datetime_cols].max()
+        }
+
+    @cached_property
+    def _missing_counts(self) -> pd.Series:
+        """Null count per column over the full frame, shared by profile, plots and summary."""
+        return self.df.isna().sum()
+
+    @cached_property
+    def _sorted_numeric(self) -> np.ndarray:
+        """Numeric columns as rows of ascending float64 values (NaN last), sorted once."""
+        values = self._sample[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        # Rows must be contiguous for a fast sort along the last axis
+        return np.sort(np.ascontiguousarray(values.T), axis=1)
+
+    def _numeric_stats(self) -> pd.DataFrame:
+        """Compute descriptive stats for all numeric columns from the sorted value matrix."""
+        if len(self.numeric_cols) == 0:
+            return pd.DataFrame(columns=["count", *NUMERIC_STATS], dtype=np.float64)
+        values = self._sorted_numeric
+        rows = np.arange(values.shape[0])
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            missing = np.isnan(values)
+            valid = values.shape[1] - missing.sum(axis=1)
+            count = valid.astype(np.float64)
+            # Order statistics are direct reads since each row is sorted with NaN last
+            last = np.maximum(valid - 1, 0)
+            # Both middle indices coincide for odd counts
+            median = (values[rows, last // 2] + values[rows, valid // 2]) / 2
+            mean = np.nansum(values, axis=1) / count
+            # Central moment sums for every column at once. Zeroing the missing entries once
+            # lets plain sums replace nansum (which copies its input on every call), and the
+            # powers are raised in place so only two full-size buffers are allocated.
+            centered = values - mean[:, np.newaxis]
+            centered[missing] = 0.0
+            power = centered * centered
+            m2 = power.sum(axis=1)
+            power *= centered
+            m3 = power.sum(axis=1)
+            power *= centered
+            m4 = power.sum(axis=1)
+            # Bias-corrected estimators, matching pandas' std/skew/kurt
+            std = np.sqrt(m2 / (count - 1))
+            skewness = count * np.sqrt(count - 1) / (count - 2) * m3 / m2 ** 1.5
+            kurtosis = (count * (count + 1) * (count - 1) * m4 / ((count - 2) * (count - 3) * m2 ** 2)
+                        - 3 * (count - 1) ** 2 / ((count - 2) * (count - 3)))
+            # Constant columns and too few observations report 0 rather than NaN
+            skewness = np.where((count > 2) & (m2 > 0), skewness, 0.0)
+            kurtosis = np.where((count > 3) & (m2 > 0), kurtosis, 0.0)
+            result = {
+                "count": count,
+                "mean": mean,
+                "std": std,
+                "min": values[rows, 0],
+                "max": values[rows, last],
+                "median": median,
+                "skewness": skewness,
+                "kurtosis": kurtosis
+            }
+        stats = pd.DataFrame(result, index=self.numeric_cols)
+        # Integers above 2**53 don't survive the float64 matrix, so integer bounds are read
+        # from the columns themselves and stay exact (and serialize as ints)
+        integer_cols = [col for col in self.numeric_cols if self._sample[col].dtype.kind in "iu"]
+        if integer_cols:
+            integers = self._sample[integer_cols]
+            for name, bounds in (("min", integers.min()), ("max", integers.max())):
+                stats[name] = stats[name].astype(object)
+                stats.loc[integer_cols, name] = bounds
+        return stats
 
-    def _truncate_string(self, s: str, max_length: int = 100) -> str:
-        """Truncate a string to a maximum length."""
-        return s[:max_length] + '...' if len(s) > max_length else s
+    def _top_values(self, column: str, n: int = 5, max_length: int = 100) -> pd.Series:
+        """Most frequent values of a column, with long strings cut to max_length characters."""
+        counts = self._value_counts(column)
+        keys = counts.index
+        if isinstance(keys, pd.CategoricalIndex):
+            keys = keys.astype(keys.categories.dtype)
+        if keys.inferred_type == "string":
+            keys = keys.astype("string")
+            if (keys.str.len() > max_length).any():
+                # Slice the distinct values in one vectorized pass; regrouping merges keys that now coincide
+                counts = counts.groupby(keys.str.slice(0, max_length), sort=False).sum()
+                counts = counts.sort_values(ascending=False, kind="stable")
+        return counts.head(n)
 
-    def _profile_column(self, column: str) -> Dict[str, Any]:
-        """Generate profile for a single column."""
+    def _profile_column(self, column: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Assemble the profile for a single column from precomputed frame stats."""
         series = self.df[column]
+        missing_count = stats["missing"][column]
+        total_count = len(series)
         
         # Handle empty or all-null columns
-        if series.empty or series.isna().all():
+        if series.empty or missing_count == total_count:
             return {
-                "data_type": str(series.dtype),
-                "missing_count": len(series),
+                "data_type": self._source_dtypes[column],
+                "missing_count": total_count,
                 "missing_percentage": 100.0,
                 "unique_count": 0,
-                "top_values": {}
+                "top_values": {},
+                "approximate": False
             }
         
-        missing_count = series.isna().sum()
-        total_count = len(series)
-        
-        # Handle value counts with truncation for string values
-        value_counts = series.value_counts()
-        top_values = {}
-        for k, v in value_counts.head(5).items():
-            key = str(k)
-            if isinstance(k, str) and len(k) > 100:
-                key = self._truncate_string(k)
-            top_values[key] = self._convert_to_serializable(v)
+        value_counts = self._value_counts(column)
+        # str() labels match the frontend's string keys; to_dict boxes the counts natively
+        top_values = self._top_values(column).rename(index=str).to_dict()
         
         profile = {
-            "data_type": str(series.dtype),
-            "missing_count": self._convert_to_serializable(missing_count),
-            "missing_percentage": self._convert_to_serializable(missing_count / total_count * 100 if total_count > 0 else 0),
-            "unique_count": self._convert_to_serializable(series.nunique() or 0),
-            "top_values": top_values
+            "data_type": self._source_dtypes[column],
+            "missing_count": missing_count,
+            "missing_percentage": missing_count / total_count * 100 if total_count > 0 else 0,
+            "unique_count": len(value_counts),
+            "top_values": top_values,
+            # Unique count, top values and numeric stats come from the row sample
+            "approximate": self.sampled
         }
         
         if column in self.numeric_cols:
-            non_null = series.dropna()
-            if len(non_null) > 0:
-                profile["numeric_stats"] = {
-                    "mean": self._convert_to_serializable(non_null.mean()),
-                    "std": self._convert_to_serializable(non_null.std()),
-                    "min": self._convert_to_serializable(non_null.min()),
-                    "max": self._convert_to_serializable(non_null.max()),
-                    "median": self._convert_to_serializable(non_null.median()),
-                    "skewness": self._convert_to_serializable(stats.skew(non_null) if len(non_null) > 2 else 0),
-                    "kurtosis": self._convert_to_serializable(stats.kurtosis(non_null) if len(non_null) > 2 else 0)
-                }
+            numeric = stats["numeric"].loc[column]
+            if numeric["count"] > 0:
+                profile["numeric_stats"] = {name: numeric[name] for name in NUMERIC_STATS}
         
         if column in self.datetime_cols:
-            non_null = series.dropna()
-            if len(non_null) > 0:
+            min_date, max_date = stats["min_date"][column], stats["max_date"][column]
+            if pd.notna(min_date):
                 profile["temporal_stats"] = {
-                    "min_date": self._convert_to_serializable(non_null.min()),
-                    "max_date": self._convert_to_serializable(non_null.max()),
-                    "date_range_days": (non_null.max() - non_null.min()).days
+                    "min_date": min_date,
+                    "max_date": max_date,
+                    "date_range_days": (max_date - min_date).days
                 }
             
         return profile
 
-    def generate_visualizations(self) -> Dict[str, Dict[str, Any]]:
-        """Generate appropriate visualizations for all columns."""
+    def _format_datetimes(self, series: pd.Series) -> pd.Series:
+        """Format a datetime column as ISO 8601 strings, with None for missing values."""
+        return series.dt.strftime("%Y-%m-%dT%H:%M:%S").where(series.notna(), None)
+
+    def generate_visualizations(self, max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Generate appropriate visualizations for all columns.
+
+        Figures are returned as raw plotly dicts (numpy arrays included) and are
+        serialized once, with to_json, when the response is written. With
+        max_workers > 1 the per-column figures are built in a process pool.
+        """
         visualizations = {}
         
         try:
+            # Each job carries only the data its figure needs, so workers never get the whole frame
+            jobs = []
+            # Empty and all-null columns have nothing to plot; skip them before any counting
+            populated = self._missing_counts < len(self.df)
+            
             # Numeric columns
             for col in self.numeric_cols:
-                if self.df[col].nunique() > 1:  # Only visualize if there's variation
-                    fig = px.histogram(self.df, x=col, nbins=30)
-                    viz_dict = self._ensure_json_serializable(fig.to_dict())
-                    visualizations[f"{col}_histogram"] = viz_dict
+                if len(self._value_counts(col)) > 1:  # Only visualize if there's variation
+                    jobs.append((f"{col}_histogram", "histogram", col, self._sample[col]))
                 
             # Categorical columns
             for col in self.categorical_cols:
-                value_counts = self.df[col].value_counts()
+                if not populated[col]:
+                    continue
+                value_counts = self._value_counts(col)
                 if len(value_counts) > 0 and len(value_counts) <= 20:  # Only for reasonable number of categories
-                    df_plot = pd.DataFrame({
-                        'category': value_counts.index,
-                        'count': value_counts.values
-                    })
-                    fig = px.bar(df_plot, x='category', y='count')
-                    viz_dict = self._ensure_json_serializable(fig.to_dict())
-                    visualizations[f"{col}_bar"] = viz_dict
+                    jobs.append((f"{col}_bar", "bar", col, value_counts))
                     
             # Time series
             for col in self.datetime_cols:
-                if self.df[col].nunique() > 1:  # Only visualize if there's variation
-                    df_plot = self.df.copy()
-                    df_plot[col] = df_plot[col].apply(lambda x: x.isoformat() if pd.notnull(x) else None)
-                    fig = px.line(df_plot, x=col)
-                    viz_dict = self._ensure_json_serializable(fig.to_dict())
-                    visualizations[f"{col}_line"] = viz_dict
+                if populated[col] and len(self._value_counts(col)) > 1:  # Only visualize if there's variation
+                    jobs.append((f"{col}_line", "line", col, self._format_datetimes(self._sample[col])))
+            
+            if max_workers is not None and max_workers > 1 and len(jobs) >= MIN_PARALLEL_FIGURES:
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [pool.submit(_column_figure, kind, col, data) for _, kind, col, data in jobs]
+                    figures = [future.result() for future in futures]
+            else:
+                figures = [_column_figure(kind, col, data) for _, kind, col, data in jobs]
+            visualizations.update(zip((key for key, *_ in jobs), figures))
                 
             # Correlation matrix for numeric columns
-            if len(self.numeric_cols) > 1 and len(self.df) > 1:  # Need at least 2 numeric columns and 2 rows
-                corr_matrix = self.df[self.numeric_cols].corr()
-                fig = px.imshow(
-                    corr_matrix.values,
-                    labels=dict(x="Features", y="Features", color="Correlation"),
-                    x=corr_matrix.columns,
-                    y=corr_matrix.columns
-                )
-                viz_dict = self._ensure_json_serializable(fig.to_dict())
-                visualizations["correlation_heatmap"] = viz_dict
+            corr_matrix = self._corr_matrix
+            if corr_matrix is not None:
+                visualizations["correlation_heatmap"] = _correlation_figure(corr_matrix)
         except Exception as e:
             logger.error(f"Error generating visualizations: {str(e)}")
             raise RuntimeError(f"Failed to generate visualizations: {str(e)}")
@@ -207,13 +622,17 @@ class DataProfiler:
         special_types = []
         if any('text' in str(self.df[col].dtype).lower() for col in self.df.columns):
             special_types.append("text")
-        if any(self.df[col].astype(str).str.contains('[^\x00-\x7F]').any() for col in self.df.columns):
-            special_types.append("special characters")
+        # Only text-like columns can hold non-ASCII characters; stop at the first hit
+        for col in self.df.select_dtypes(include=['object', 'string', 'category']).columns:
+            values = self.df[col].dropna().astype(str)
+            if (values.str.len() != values.str.encode('ascii', errors='ignore').str.len()).any():
+                special_types.append("special characters")
+                break
         if special_types:
             summary_parts.append(f"The dataset includes {' and '.join(special_types)} data.")
         
         # Missing values
-        total_missing = self.df.isna().sum().sum()
+        total_missing = self._missing_counts.sum()
         if total_missing > 0:
             summary_parts.append(
                 f"There are {total_missing} missing values across all columns."
@@ -225,22 +644,22 @@ class DataProfiler:
             summary_parts.append(f"There are {len(empty_cols)} empty columns.")
             
         # Correlation insights
-        if len(self.numeric_cols) > 1 and len(self.df) > 1:
-            corr_matrix = self.df[self.numeric_cols].corr()
-            high_corr = np.where(np.abs(corr_matrix) > 0.8)
-            high_corr_pairs = [(corr_matrix.index[x], corr_matrix.columns[y], corr_matrix.iloc[x, y])
-                              for x, y in zip(*high_corr) if x != y]
+        corr_matrix = self._corr_matrix
+        if corr_matrix is not None:
+            # Strongest off-diagonal pair from the upper triangle; NaN correlations count as 0
+            values = corr_matrix.values
+            strength = np.triu(np.nan_to_num(np.abs(values)), k=1)
+            x, y = np.unravel_index(np.argmax(strength), strength.shape)
             
-            if high_corr_pairs:
-                pair = high_corr_pairs[0]
+            if strength[x, y] > 0.8:
                 summary_parts.append(
-                    f"There is a strong correlation ({float(pair[2]):.2f}) between {pair[0]} and {pair[1]}."
+                    f"There is a strong correlation ({float(values[x, y]):.2f}) between {corr_matrix.index[x]} and {corr_matrix.columns[y]}."
                 )
         
         return " ".join(summary_parts)
 
     def generate_specific_visualization(self, viz_type: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Generate a specific type of visualization."""
+        """Generate a specific type of visualization as a raw plotly dict."""
         try:
             # First check if visualization type is supported
             if viz_type not in ["histogram", "bar", "line", "correlation"]:
@@ -252,44 +671,34 @@ class DataProfiler:
                     raise ValueError("Invalid column specified")
                 
             if viz_type == "histogram" and columns:
-                if self.df[columns[0]].nunique() <= 1:
+                value_counts = self._value_counts(columns[0])
+                if len(value_counts) <= 1:
                     raise RuntimeError("Insufficient variation for visualization")
-                fig = px.histogram(self.df, x=columns[0], nbins=30)
-                return self._ensure_json_serializable(fig.to_dict())
+                if self.df[columns[0]].dtype.kind in "iufM":
+                    return _column_figure("histogram", columns[0], self._sample[columns[0]])
+                # Text, category and bool values have no bins; plot one bar per distinct value
+                return _column_figure("bar", columns[0], value_counts)
                 
             elif viz_type == "bar" and columns:
-                value_counts = self.df[columns[0]].value_counts()
+                value_counts = self._value_counts(columns[0])
                 if len(value_counts) == 0:
                     raise RuntimeError("No data available for visualization")
-                df_plot = pd.DataFrame({
-                    'category': value_counts.index,
-                    'count': value_counts.values
-                })
-                fig = px.bar(df_plot, x='category', y='count')
-                return self._ensure_json_serializable(fig.to_dict())
+                return _column_figure("bar", columns[0], value_counts)
                 
             elif viz_type == "line" and columns:
-                if self.df[columns[0]].nunique() <= 1:
+                if len(self._value_counts(columns[0])) <= 1:
                     raise RuntimeError("Insufficient variation for visualization")
-                df_plot = self.df.copy()
+                data = self._sample[columns[0]]
                 if columns[0] in self.datetime_cols:
-                    df_plot[columns[0]] = df_plot[columns[0]].apply(lambda x: x.isoformat() if pd.notnull(x) else None)
-                fig = px.line(df_plot, x=columns[0])
-                return self._ensure_json_serializable(fig.to_dict())
+                    data = self._format_datetimes(data)
+                return _column_figure("line", columns[0], data)
                 
             elif viz_type == "correlation":
                 if len(self.numeric_cols) <= 1:
                     raise RuntimeError("Insufficient numeric columns for correlation")
-                if len(self.df) <= 1:
+                if len(self._sample) <= 1:
                     raise RuntimeError("Insufficient data for correlation")
-                corr_matrix = self.df[self.numeric_cols].corr()
-                fig = px.imshow(
-                    corr_matrix.values,
-                    labels=dict(x="Features", y="Features", color="Correlation"),
-                    x=corr_matrix.columns,
-                    y=corr_matrix.columns
-                )
-                return self._ensure_json_serializable(fig.to_dict())
+                return _correlation_figure(self._corr_matrix)
             
         except ValueError as e:
             # Re-raise ValueError exceptions directly
@@ -1,81 +1,128 @@
 from fastapi import UploadFile, HTTPException
 import pandas as pd
 import json
-from io import StringIO
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import pyarrow.parquet as pq
-import io
 import logging
+import os
+import xxhash
+from typing import BinaryIO
+from app.utils.data_profiler import SOURCE_DTYPES_ATTR
 
 logger = logging.getLogger(__name__)
 
 class FileHandler:
     async def process_file(self, file: UploadFile) -> pd.DataFrame:
         """Process uploaded file and return a pandas DataFrame."""
+        # Validate file size first
+        self.validate_file_size(file)
+        # The upload is already spooled by Starlette (to disk past 1 MB), so the
+        # parsers read that file directly instead of a bytes copy held in memory
+        return self.parse_file(file.filename, file.file)
+
+    def parse_file(self, filename: str, buffer: BinaryIO) -> pd.DataFrame:
+        """Parse file content by its extension and return a pandas DataFrame."""
         try:
-            logger.info(f"Processing file: {file.filename}")
-            # Validate file size first
-            self.validate_file_size(file)
-            
-            content = await file.read()
-            
-            if file.filename.endswith('.csv'):
-                return self._process_csv(content)
-            elif file.filename.endswith(('.xls', '.xlsx')):
-                return self._process_excel(content)
-            elif file.filename.endswith('.parquet'):
-                return self._process_parquet(content)
-            elif file.filename.endswith('.json'):
-                return self._process_json(content)
+            logger.info(f"Processing file: {filename}")
+            if filename.endswith('.csv'):
+                df = self._process_csv(buffer)
+            elif filename.endswith(('.xls', '.xlsx')):
+                df = self._process_excel(buffer)
+            elif filename.endswith('.parquet'):
+                df = self._process_parquet(buffer)
+            elif filename.endswith('.json'):
+                df = self._process_json(buffer)
             else:
                 raise HTTPException(
                     status_code=400,
                     detail="Unsupported file format. Please upload CSV, Excel, Parquet, or JSON files."
                 )
+            return self._downcast_integers(df)
         except Exception as e:
             logger.error(f"Error processing file: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
-    def _process_csv(self, content: bytes) -> pd.DataFrame:
+    def _downcast_integers(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store integer columns in the smallest integer dtype that holds their values."""
+        # Lossless, unlike float32 downcasting, and every later pass moves fewer bytes
+        source_dtypes = {}
+        for col in df.select_dtypes(include=['integer']).columns:
+            source_dtypes[col] = str(df[col].dtype)
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        # The profile reports the type the data was read as, not the storage type
+        df.attrs[SOURCE_DTYPES_ATTR] = source_dtypes
+        return df
+
+    def _process_csv(self, buffer: BinaryIO) -> pd.DataFrame:
         """Process CSV file content."""
         try:
-            text = content.decode('utf-8')
             logger.info("Attempting to read CSV data")
-            df = pd.read_csv(StringIO(text))
+            # Arrow's multithreaded C++ reader decodes UTF-8 itself; empty fields become nulls
+            # as with pandas, and date columns stay datetime64 instead of date objects
+            try:
+                table = pacsv.read_csv(
+                    buffer,
+                    read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+                    convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+                )
+            except pa.ArrowInvalid as e:
+                # Arrow rejects ragged rows that pandas pads with missing values
+                logger.info(f"Arrow could not parse the CSV ({str(e)}), falling back to pandas")
+                return self._process_csv_with_pandas(buffer)
+            if len(set(table.column_names)) != table.num_columns:
+                # pandas renames duplicate headers (a, a.1); Arrow can't convert them
+                logger.info("CSV has duplicate column names, falling back to pandas")
+                return self._process_csv_with_pandas(buffer)
+            if any(pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type) for field in table.schema):
+                # Arrow keeps text that isn't valid UTF-8 as binary instead of rejecting it
+                logger.info("CSV has non-UTF-8 text, falling back to pandas")
+                return self._process_csv_with_pandas(buffer)
+            df = table.to_pandas(date_as_object=False)
             logger.info(f"Successfully read CSV with shape: {df.shape}")
             return df
         except Exception as e:
             logger.error(f"Error processing CSV file: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Error processing CSV file: {str(e)}")
 
-    def _process_excel(self, content: bytes) -> pd.DataFrame:
+    def _process_csv_with_pandas(self, buffer: BinaryIO) -> pd.DataFrame:
+        """Read CSV content with pandas, which accepts what Arrow's reader is strict about."""
+        buffer.seek(0)
+        # Invalid UTF-8 raises here rather than being read as bytes
+        df = pd.read_csv(buffer, encoding='utf-8')
+        logger.info(f"Successfully read CSV with pandas with shape: {df.shape}")
+        return df
+
+    def _process_excel(self, buffer: BinaryIO) -> pd.DataFrame:
         """Process Excel file content."""
         try:
             logger.info("Attempting to read Excel data")
-            df = pd.read_excel(io.BytesIO(content))
+            df = pd.read_excel(buffer)
             logger.info(f"Successfully read Excel with shape: {df.shape}")
             return df
         except Exception as e:
             logger.error(f"Error processing Excel file: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Error processing Excel file: {str(e)}")
 
-    def _process_parquet(self, content: bytes) -> pd.DataFrame:
+    def _process_parquet(self, buffer: BinaryIO) -> pd.DataFrame:
         """Process Parquet file content."""
         try:
             logger.info("Attempting to read Parquet data")
-            table = pq.read_table(io.BytesIO(content))
-            df = table.to_pandas()
+            table = pq.read_table(buffer, use_threads=True)
+            # Free each Arrow column as soon as its pandas block is built to halve peak memory
+            df = table.to_pandas(split_blocks=True, self_destruct=True, date_as_object=False)
+            del table
             logger.info(f"Successfully read Parquet with shape: {df.shape}")
             return df
         except Exception as e:
             logger.error(f"Error processing Parquet file: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Error processing Parquet file: {str(e)}")
 
-    def _process_json(self, content: bytes) -> pd.DataFrame:
+    def _process_json(self, buffer: BinaryIO) -> pd.DataFrame:
         """Process JSON file content."""
         try:
             logger.info("Attempting to read JSON data")
-            text = content.decode('utf-8')
-            data = json.loads(text)
+            data = json.load(buffer)
             df = pd.json_normalize(data)
             logger.info(f"Successfully read JSON with shape: {df.shape}")
             return df
@@ -83,11 +130,26 @@ class FileHandler:
             logger.error(f"Error processing JSON file: {str(e)}")
             raise HTTPException(status_code=400, detail=f"Error processing JSON file: {str(e)}")
 
+    def compute_hash(self, file: UploadFile, chunk_size: int = 1024 * 1024) -> int:
+        """Compute a fast content hash of the upload for result caching."""
+        try:
+            hasher = xxhash.xxh3_64()
+            file.file.seek(0)
+            while chunk := file.file.read(chunk_size):
+                hasher.update(chunk)
+            file.file.seek(0)  # Reset file pointer
+            return hasher.intdigest()
+        except Exception as e:
+            logger.error(f"Error hashing file: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Error hashing file: {str(e)}")
+
     def validate_file_size(self, file: UploadFile, max_size_mb: int = 100) -> bool:
         """Validate file size against maximum allowed size."""
         try:
             max_size_bytes = max_size_mb * 1024 * 1024  # Convert MB to bytes
-            file_size = len(file.file.read())
+            # Measure the spooled upload by seeking to its end instead of reading it
+            file.file.seek(0, os.SEEK_END)
+            file_size = file.file.tell()
             file.file.seek(0)  # Reset file pointer
             
             if file_size > max_size_bytes:
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """Process-local LRU cache of serialized responses keyed by upload content hash."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached value for key, or None on a miss."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        logger.debug("Result cache hit for %s", key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """Store a value, evicting least recently used entries until the total fits."""
+        # A response larger than the whole cache would only flush everything else
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.current_bytes -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self.current_bytes += len(value)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
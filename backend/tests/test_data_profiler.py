@@ -5,9 +5,13 @@ from app.utils.data_profiler import DataProfiler
 import json
 from datetime import datetime, timedelta
 
-@pytest.fixture
+def _dumps(profiler, obj):
+    """Serialize through the profiler's orjson path and decode the result."""
+    return json.loads(profiler.to_json(obj))
+
+@pytest.fixture(scope='session')
 def sample_dataframe():
-    """Create a sample dataframe with various data types for testing."""
+    """Create a sample dataframe with various data types for testing (shared; don't mutate)."""
     return pd.DataFrame({
         'numeric': [1, 2, 3, 4, 5, np.nan],
         'categorical': ['A', 'B', 'A', 'C', 'B', None],
@@ -16,9 +20,9 @@ def sample_dataframe():
         'float': [1.1, 2.2, 3.3, np.nan, 5.5, 6.6]
     })
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def edge_case_dataframe():
-    """Create a dataframe with edge cases."""
+    """Create a dataframe with edge cases (shared; don't mutate)."""
     # Create a DataFrame with all columns having the same length
     df = pd.DataFrame({
         'all_null': [None] * 3,
@@ -41,12 +45,13 @@ def edge_case_dataframe():
 @pytest.fixture
 def data_profiler(sample_dataframe):
     """Create a DataProfiler instance with the sample dataframe."""
-    return DataProfiler(sample_dataframe)
+    # Each test gets its own copy so changes to profiler.df can't leak into the shared frame
+    return DataProfiler(sample_dataframe, copy=True)
 
 @pytest.fixture
 def edge_case_profiler(edge_case_dataframe):
     """Create a DataProfiler instance with edge case dataframe."""
-    return DataProfiler(edge_case_dataframe)
+    return DataProfiler(edge_case_dataframe, copy=True)
 
 def test_initialization(data_profiler, sample_dataframe):
     """Test if DataProfiler initializes correctly."""
@@ -54,7 +59,27 @@ def test_initialization(data_profiler, sample_dataframe):
     assert len(data_profiler.categorical_cols) == 2  # categorical and boolean
     assert len(data_profiler.datetime_cols) == 1
     assert isinstance(data_profiler.df, pd.DataFrame)
-    assert data_profiler.df.equals(sample_dataframe)
+    # Object columns are re-encoded as category or Arrow strings; values and nulls are unchanged
+    encoded, original = data_profiler.df.astype(object), sample_dataframe.astype(object)
+    assert encoded.where(encoded.notna(), None).equals(original.where(original.notna(), None))
+
+def test_low_cardinality_encoding(data_profiler, sample_dataframe):
+    """Test that low-cardinality object columns are stored as category and other text as Arrow strings."""
+    assert data_profiler.df['boolean'].dtype == 'category'
+    # 3 distinct values in 6 rows is not below the 50% threshold
+    assert data_profiler.df['categorical'].dtype == 'string[pyarrow]'
+    assert sample_dataframe['categorical'].dtype == object
+    # The caller's frame is left untouched
+    assert sample_dataframe['boolean'].dtype == object
+
+def test_copy_option(sample_dataframe):
+    """Test that the profiler shares the caller's data unless asked to copy."""
+    shared = DataProfiler(sample_dataframe)
+    assert np.shares_memory(shared.df['float'].to_numpy(), sample_dataframe['float'].to_numpy())
+    
+    copied = DataProfiler(sample_dataframe, copy=True)
+    copied.df.loc[0, 'float'] = 100.0
+    assert sample_dataframe.loc[0, 'float'] == 1.1
 
 def test_edge_case_initialization(edge_case_profiler):
     """Test initialization with edge case data."""
@@ -113,6 +138,52 @@ def test_edge_case_serialization(edge_case_profiler):
     assert isinstance(converted['timestamp'], str)
     assert converted['special'] == '한글'
 
+def test_to_json(data_profiler):
+    """Test orjson serialization of raw numpy/pandas structures."""
+    payload = {
+        'array': np.array([1.5, np.nan]),
+        'objects': np.array(['a', None], dtype=object),
+        'series': pd.Series([4, 5, 6]),
+        'timestamp': pd.Timestamp('2024-01-01'),
+        1: np.int64(7)
+    }
+    decoded = _dumps(data_profiler, payload)
+    assert decoded['array'] == [1.5, None]
+    assert decoded['objects'] == ['a', None]
+    assert decoded['series'] == [4, 5, 6]
+    assert decoded['timestamp'].startswith('2024-01-01')
+    assert decoded['1'] == 7
+
+def test_arrow_backed_columns():
+    """Test that Arrow-backed and nullable numeric columns are profiled as numeric."""
+    df = pd.DataFrame({
+        'ints': pd.array([1, 2, None, 4], dtype='int64[pyarrow]'),
+        'floats': pd.array([1.5, None, float('inf'), 3.0], dtype='double[pyarrow]'),
+        'nullable': pd.array([1, None, 3, 4], dtype='Int64'),
+        'text': pd.array(['a', 'b', 'a', None], dtype='string[pyarrow]'),
+        'duration': pd.to_timedelta([1, 2, None, 4], unit='h'),
+    })
+    profiler = DataProfiler(df)
+    # Infinite values are still excluded; timedeltas are never numeric
+    assert list(profiler.numeric_cols) == ['ints', 'nullable']
+    assert list(profiler.categorical_cols) == ['text']
+    
+    profile = _dumps(profiler, profiler.generate_profile())
+    assert profile['ints']['data_type'] == 'int64[pyarrow]'
+    assert profile['ints']['numeric_stats']['mean'] == pytest.approx(7 / 3)
+    assert 'numeric_stats' not in profile['duration']
+
+def test_integer_bounds_are_exact():
+    """Test that integer min/max stay exact integers beyond float64 precision."""
+    df = pd.DataFrame({'big': [2**62 + 1, 5, 7], 'float': [1.5, 2.5, np.nan]})
+    profiler = DataProfiler(df)
+    
+    stats = _dumps(profiler, profiler.generate_profile())['big']['numeric_stats']
+    assert stats['min'] == 5 and isinstance(stats['min'], int)
+    assert stats['max'] == 2**62 + 1
+    by_metric = _dumps(profiler, profiler.generate_profile(layout='soa'))['numeric_stats']
+    assert by_metric['max'] == [2**62 + 1, 2.5]
+
 def test_profile_generation(data_profiler):
     """Test if profile generation works and is JSON serializable."""
     profile = data_profiler.generate_profile()
@@ -122,7 +193,7 @@ def test_profile_generation(data_profiler):
     
     # Test if profile is JSON serializable
     try:
-        json.dumps(profile)
+        _dumps(data_profiler, profile)
     except TypeError as e:
         pytest.fail(f"Profile is not JSON serializable: {e}")
     
@@ -136,10 +207,19 @@ def test_profile_generation(data_profiler):
     cat_profile = profile['categorical']
     assert 'top_values' in cat_profile
     assert cat_profile['unique_count'] == 3
+    # Storage re-encoding (category, Arrow strings) doesn't change the reported type
+    assert cat_profile['data_type'] == 'object'
+    assert profile['boolean']['data_type'] == 'object'
     
     # Test datetime column profile
     datetime_profile = profile['datetime']
     assert 'temporal_stats' in datetime_profile
+    
+    # Missing and unique counts come from shared frame-level passes but match pandas per column
+    df = data_profiler.df
+    for col in df.columns:
+        assert profile[col]['missing_count'] == df[col].isna().sum()
+        assert profile[col]['unique_count'] == df[col].nunique()
 
 def test_edge_case_profile(edge_case_profiler):
     """Test profile generation with edge case data."""
@@ -189,7 +269,7 @@ def test_visualization_generation(data_profiler):
     
     # Test if visualizations are JSON serializable
     try:
-        json.dumps(visualizations)
+        _dumps(data_profiler, visualizations)
     except TypeError as e:
         pytest.fail(f"Visualizations are not JSON serializable: {e}")
     
@@ -197,6 +277,15 @@ def test_visualization_generation(data_profiler):
     for viz_name, viz_data in visualizations.items():
         assert 'data' in viz_data
         assert 'layout' in viz_data
+    
+    # Plot data is handed over without a conversion pass; orjson writes the arrays
+    assert isinstance(visualizations['correlation_heatmap']['data'][0]['z'], np.ndarray)
+    
+    # Histograms carry bin counts rather than the raw column
+    histogram = visualizations['numeric_histogram']['data'][0]
+    assert histogram['type'] == 'bar'
+    assert len(histogram['y']) == 30
+    assert histogram['y'].sum() == 5  # non-null values
 
 def test_edge_case_visualization(edge_case_profiler):
     """Test visualization generation with edge case data."""
@@ -222,7 +311,7 @@ def test_edge_case_visualization(edge_case_profiler):
     
     # Test if all visualizations are JSON serializable
     try:
-        json.dumps(visualizations)
+        _dumps(edge_case_profiler, visualizations)
     except TypeError as e:
         pytest.fail(f"Edge case visualizations are not JSON serializable: {e}")
 
@@ -278,6 +367,23 @@ def test_specific_visualization(data_profiler):
     with pytest.raises(ValueError):
         data_profiler.generate_specific_visualization("invalid_type")
 
+def test_histogram_of_non_numeric_columns(data_profiler):
+    """Test that histograms of text, bool and datetime columns keep their own values on the x axis."""
+    # Text and bool columns are drawn as one bar per distinct value
+    text = _dumps(data_profiler, data_profiler.generate_specific_visualization("histogram", ["categorical"]))
+    assert sorted(text['data'][0]['x']) == ['A', 'B', 'C']
+    assert sum(text['data'][0]['y']) == 5
+    
+    boolean = _dumps(data_profiler, data_profiler.generate_specific_visualization("histogram", ["boolean"]))
+    assert sorted(boolean['data'][0]['x']) == [False, True]
+    assert sum(boolean['data'][0]['y']) == 5
+    
+    # Datetimes are binned as dates, not as epoch nanoseconds
+    dates = _dumps(data_profiler, data_profiler.generate_specific_visualization("histogram", ["datetime"]))
+    trace = dates['data'][0]
+    assert sum(trace['y']) == 6
+    assert all(x.startswith('2024-01-0') for x in trace['x'])
+
 def test_edge_case_specific_visualization(edge_case_profiler):
     """Test specific visualization generation with edge cases."""
     # Test empty column
@@ -361,4 +467,93 @@ def test_single_row_dataframe():
     assert isinstance(viz, dict)
     
     # Ensure no correlation heatmap for single row
-    assert 'correlation_heatmap' not in viz 
\ No newline at end of file
+    assert 'correlation_heatmap' not in viz
+
+def test_sampled_profile():
+    """Test that large frames profile distributions on a sample but count missing values exactly."""
+    n = 1000
+    df = pd.DataFrame({
+        'numeric': np.where(np.arange(n) % 10 == 0, np.nan, np.arange(n, dtype=float)),
+        'category': np.array(['A', 'B', 'C', 'D'])[np.arange(n) % 4]
+    })
+    profiler = DataProfiler(df, sample_rows=200)
+    assert len(profiler._sample) == 200
+    
+    profile = profiler.generate_profile()
+    assert profile['numeric']['missing_count'] == 100
+    assert profile['numeric']['missing_percentage'] == 10.0
+    assert sum(profile['category']['top_values'].values()) == 200
+    assert profile['numeric']['approximate'] is True
+    assert profiler.generate_profile(layout='soa')['approximate'] is True
+    # The sample keeps the frame's row order
+    assert profiler._sample.index.is_monotonic_increasing
+    
+    # Line charts pair each value with its row in the full frame
+    dates = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=n)})
+    line = DataProfiler(dates, sample_rows=200).generate_specific_visualization("line", ["date"])['data'][0]
+    expected = dates['date'].dt.strftime('%Y-%m-%dT%H:%M:%S')[line['y']]
+    assert list(line['x']) == list(expected)
+    assert 0 <= profile['numeric']['numeric_stats']['min'] <= profile['numeric']['numeric_stats']['max'] < n
+    
+    assert f"{n} rows" in profiler.generate_summary()
+    assert 'numeric_histogram' in profiler.generate_visualizations()
+    
+    # Frames within the limit, or with sampling disabled, are profiled in full
+    assert len(DataProfiler(df)._sample) == n
+    assert DataProfiler(df).generate_profile()['numeric']['approximate'] is False
+    assert len(DataProfiler(df, sample_rows=None)._sample) == n
+
+def test_parallel_visualizations():
+    """Test that figures built in worker processes match the serial result."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f'col_{i}': rng.normal(size=50) for i in range(8)})
+    profiler = DataProfiler(df)
+    
+    serial = profiler.generate_visualizations()
+    parallel = profiler.generate_visualizations(max_workers=2)
+    assert list(parallel) == list(serial)
+    assert profiler.to_json(parallel) == profiler.to_json(serial)
+
+def test_correlation_with_missing_values():
+    """Test that correlations over pairwise-complete rows match pandas."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(200, 4))
+    values[:, 1] += values[:, 0]
+    values[rng.random(values.shape) < 0.2] = np.nan
+    df = pd.DataFrame(values, columns=['a', 'b', 'c', 'd'])
+    
+    corr = DataProfiler(df)._corr_matrix
+    np.testing.assert_allclose(corr.values, df.corr().values, rtol=1e-10, atol=1e-12)
+
+def test_correlation_across_row_chunks(monkeypatch):
+    """Test that sums accumulated over row chunks match a single pass."""
+    monkeypatch.setattr('app.utils.data_profiler.CORR_CHUNK_ROWS', 16)
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(203, 3)) * [1.0, 1e6, 1e-3] + [0.0, 1e9, 0.0]
+    values[:, 2] += values[:, 0] * 1e-3
+    values[rng.random(values.shape) < 0.2] = np.nan
+    df = pd.DataFrame(values, columns=['a', 'b', 'c'])
+    
+    corr = DataProfiler(df)._corr_matrix
+    np.testing.assert_allclose(corr.values, df.corr().values, rtol=1e-10, atol=1e-12)
+
+def test_profile_soa_layout(data_profiler):
+    """Test that the per-metric layout carries the same values as the per-column one."""
+    by_column = _dumps(data_profiler, data_profiler.generate_profile())
+    by_metric = _dumps(data_profiler, data_profiler.generate_profile(layout='soa'))
+    
+    for i, col in enumerate(by_metric['columns']):
+        for metric in ('data_type', 'missing_count', 'missing_percentage', 'unique_count', 'top_values'):
+            assert by_metric[metric][i] == by_column[col][metric]
+    
+    numeric = by_metric['numeric_stats']
+    assert numeric['columns'] == ['numeric', 'float']
+    for i, col in enumerate(numeric['columns']):
+        assert {name: numeric[name][i] for name in by_column[col]['numeric_stats']} == by_column[col]['numeric_stats']
+    
+    temporal = by_metric['temporal_stats']
+    assert temporal['columns'] == ['datetime']
+    assert temporal['date_range_days'] == [by_column['datetime']['temporal_stats']['date_range_days']]
+    
+    with pytest.raises(ValueError):
+        data_profiler.generate_profile(layout='columns')
@@ -0,0 +1,46 @@
+import pytest
+import pandas as pd
+import io
+from fastapi import HTTPException
+from app.utils.file_handler import FileHandler
+from app.utils.data_profiler import DataProfiler
+
+@pytest.fixture
+def file_handler():
+    """Create a FileHandler instance."""
+    return FileHandler()
+
+def test_csv_with_arrow(file_handler):
+    """Test that well-formed CSV is read with nulls and datetimes."""
+    df = file_handler._process_csv(io.BytesIO(b"name,value,date\na,1,2024-01-01\n,2,2024-01-02\n"))
+    assert df.shape == (2, 3)
+    assert df['name'].isna().sum() == 1
+    assert df['date'].dtype.kind == 'M'
+
+def test_csv_ragged_rows(file_handler):
+    """Test that short rows are padded with missing values, as pandas does."""
+    df = file_handler._process_csv(io.BytesIO(b"a,b\n1,2\n3\n"))
+    assert df['a'].tolist() == [1, 3]
+    assert df['b'].isna().tolist() == [False, True]
+
+def test_csv_duplicate_headers(file_handler):
+    """Test that duplicate column names are renamed rather than rejected."""
+    df = file_handler._process_csv(io.BytesIO(b"a,a\n1,2\n"))
+    assert list(df.columns) == ['a', 'a.1']
+    assert df.iloc[0].tolist() == [1, 2]
+
+def test_csv_invalid_utf8(file_handler):
+    """Test that latin-1 text is rejected instead of being read as bytes."""
+    with pytest.raises(HTTPException) as exc_info:
+        file_handler._process_csv(io.BytesIO("name,value\ncafé,1\n".encode('latin-1')))
+    assert exc_info.value.status_code == 400
+    assert 'utf-8' in exc_info.value.detail
+
+def test_downcast_keeps_source_dtypes(file_handler):
+    """Test that narrowed integer columns are profiled with the dtype they were read as."""
+    df = file_handler._downcast_integers(pd.DataFrame({'small': [1, 2, 3], 'text': ['a', 'b', 'c']}))
+    assert df['small'].dtype == 'int8'
+
+    profile = DataProfiler(df).generate_profile()
+    assert profile['small']['data_type'] == 'int64'
+    assert profile['text']['data_type'] == 'object'
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.main import app
+
+@pytest.fixture(scope='module')
+def client():
+    """Create a test client for the API."""
+    return TestClient(app)
+
+@pytest.mark.parametrize('origin', [
+    'https://sambhar-frontend.vercel.app',
+    'https://sambhar-88lre93rr-asif-mansoors-projects.vercel.app',
+    'https://sambhar-frontend-git-feature-x-asif-mansoors-projects.vercel.app',
+])
+def test_cors_allows_project_previews(client, origin):
+    """Test that this project's Vercel deployments get CORS headers."""
+    response = client.get('/health', headers={'Origin': origin})
+    assert response.headers.get('access-control-allow-origin') == origin
+
+@pytest.mark.parametrize('origin', [
+    'https://evil.vercel.app',
+    'https://sambhar-frontend-evil.vercel.app',
+    'https://sambhar-git-main-other-team.vercel.app',
+    'https://sambhar-asif-mansoors-projects.vercel.app.evil.com',
+])
+def test_cors_rejects_other_origins(client, origin):
+    """Test that other Vercel projects, including ones named sambhar-*, cannot read responses."""
+    response = client.get('/health', headers={'Origin': origin})
+    assert 'access-control-allow-origin' not in response.headers
+    
+    preflight = client.options('/health', headers={
+        'Origin': origin,
+        'Access-Control-Request-Method': 'GET',
+    })
+    assert preflight.status_code == 400
+    assert 'access-control-allow-origin' not in preflight.headers
+
+def test_upload_through_pool(client):
+    """Test that uploads are parsed and profiled in the process pool."""
+    response = client.post('/upload', files={'file': ('pool.csv', b'name,sales\na,100\nb,250\n')})
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile['sales']['data_type'] == 'int64'
+    assert profile['sales']['numeric_stats']['max'] == 250
+
+def test_parse_error_from_pool(client):
+    """Test that errors raised while parsing in a child reach the client."""
+    response = client.post('/profile', files={'file': ('latin.csv', 'name\ncafé\n'.encode('latin-1'))})
+    assert response.status_code == 400
+    assert 'utf-8' in response.json()['detail']
+
+def test_broken_pool_is_replaced(client):
+    """Test that a child process dying fails only its own request."""
+    broken = main.profiling_pool
+    with pytest.raises(RuntimeError, match='exited unexpectedly'):
+        asyncio.run(main.run_in_pool(os._exit, 1))
+    assert main.profiling_pool is not broken
+    
+    response = client.post('/upload', files={'file': ('after.csv', b'a,b\n1,2\n')})
+    assert response.status_code == 200
+
+def test_profile_layout_parameter(client):
+    """Test that /upload returns the per-metric layout for layout=soa and rejects others."""
+    upload = {'file': ('layout.csv', b'name,sales\na,100\nb,250\n')}
+    response = client.post('/upload', params={'layout': 'soa'}, files=upload)
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile['columns'] == ['name', 'sales']
+    assert profile['missing_count'] == [0, 0]
+    
+    assert client.post('/upload', params={'layout': 'columns'}, files=upload).status_code == 422
@@ -0,0 +1,60 @@
+import io
+from fastapi import UploadFile
+from app.main import cache_key
+from app.utils.file_handler import FileHandler
+from app.utils.result_cache import ResultCache
+
+def make_upload(content: bytes, filename: str = "data.csv") -> UploadFile:
+    """Wrap bytes in an UploadFile as Starlette would."""
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+def test_eviction_order():
+    """Test that the least recently used entry is evicted first."""
+    cache = ResultCache(max_bytes=30)
+    cache.put("a", b"a" * 10)
+    cache.put("b", b"b" * 10)
+    cache.put("c", b"c" * 10)
+    assert cache.get("a") is not None  # "b" is now the oldest
+    
+    cache.put("d", b"d" * 10)
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+def test_size_cap():
+    """Test that the cache is bounded by total bytes rather than entry count."""
+    cache = ResultCache(max_bytes=100)
+    cache.put("small", b"x" * 10)
+    cache.put("large", b"y" * 80)
+    assert cache.current_bytes == 90
+    
+    cache.put("larger", b"z" * 60)
+    assert cache.get("small") is None and cache.get("large") is None
+    assert cache.current_bytes == 60
+    
+    # Replacing a key counts only the new value
+    cache.put("larger", b"z" * 20)
+    assert cache.current_bytes == 20
+    
+    # Values bigger than the whole cache are not stored and evict nothing
+    cache.put("huge", b"h" * 101)
+    assert cache.get("huge") is None
+    assert cache.get("larger") == b"z" * 20
+    
+    disabled = ResultCache(max_bytes=0)
+    disabled.put("a", b"a")
+    assert disabled.get("a") is None
+
+def test_key_stability():
+    """Test that keys depend on upload content and request parts, not on the upload object."""
+    file_handler = FileHandler()
+    content = b"a,b\n1,2\n"
+    first = cache_key(file_handler, make_upload(content), "profile")
+    assert first == cache_key(file_handler, make_upload(content), "profile")
+    assert first != cache_key(file_handler, make_upload(content + b"3,4\n"), "profile")
+    assert first != cache_key(file_handler, make_upload(content), "upload")
+    assert first != cache_key(file_handler, make_upload(content, "data.xlsx"), "profile")
+    
+    # Hashing leaves the upload readable from the start
+    upload = make_upload(content)
+    cache_key(file_handler, upload, "profile")
+    assert upload.file.read() == content
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import os
 
 # Set random seed for reproducibility
 np.random.seed(42)
@@ -8,9 +8,8 @@ np.random.seed(42)
 # Generate sample data
 n_rows = 1000
 
-# Generate dates
-base_date = datetime(2023, 1, 1)
-dates = [base_date + timedelta(days=x) for x in range(n_rows)]
+# Generate dates as one vectorized add; nanosecond unit matches the previous datetime column
+dates = (np.datetime64('2023-01-01') + np.arange(n_rows, dtype='timedelta64[D]')).astype('datetime64[ns]')
 
 # Generate numeric data
 numeric_normal = np.random.normal(100, 15, n_rows)  # Normal distribution
@@ -54,9 +53,21 @@ df = pd.DataFrame({
 # Convert category column to categorical type
 df['category'] = df['category'].astype('category')
 
-# Save as parquet file
+# Save as parquet file: zstd level 3 compresses better than the snappy default at similar
+# decode cost, and only the repetitive string columns are dictionary-encoded. Larger
+# outputs get one row group per core so Arrow can read them in parallel; the 1000-row
+# floor keeps small files, including this 1000-row sample, in a single row group
 output_file = 'sample_data.parquet'
-df.to_parquet(output_file, index=False)
+df.to_parquet(
+    output_file,
+    index=False,
+    engine='pyarrow',
+    compression='zstd',
+    compression_level=3,
+    row_group_size=max(1000, n_rows // (os.cpu_count() or 1)),
+    use_dictionary=['category', 'text'],
+    data_page_size=1 << 20
+)
 
 print(f"Generated {output_file} with {n_rows} rows")
 print("\nDataset Summary:")